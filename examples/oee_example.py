@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 from oee_calculator import OEECalculator  # Replace with your module name
@@ -26,9 +27,9 @@ end_time = datetime(2024, 12, 15, 10, 0, 0)
 oee_metrics = calculator.calculate_oee(operations_df, start_time, end_time)
 
 # Step 6: Display results
-print("OEE Metrics:")
-for metric, value in oee_metrics.items():
-    print(f"{metric.capitalize()}: {value}")
+sys.stdout.write(
+    "OEE Metrics:\n" + "\n".join(f"{metric.capitalize()}: {value}" for metric, value in oee_metrics.items()) + "\n"
+)
 
 # Optional: Visualize results (requires matplotlib)
 try:
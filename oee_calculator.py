@@ -1,38 +1,248 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 import warnings
 import yaml
+from pandas.api.types import is_datetime64_any_dtype
+
+__all__ = ["OEECalculator"]
+
+# libyaml's C parser when PyYAML was built with it, otherwise the pure-Python loader with the same behavior
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Loss categories whose effective durations count against each OEE component
+LOSS_BUCKETS = {
+    "availability": ("unplanned_stop", "planned_stop"),
+    "performance": ("small_stop", "speed_loss"),
+    "quality": ("rework/scrap", "startup_loss"),
+}
+
+# Keys of the calculate_oee result
+_METRIC_NAMES = (
+    "availability",
+    "performance",
+    "quality",
+    "oee",
+    "value_added_time",
+    "availability_losses",
+    "performance_losses",
+    "quality_losses",
+    "total_time",
+)
+# Decimals each metric is rounded to with round(): ratios to 3, durations to 2
+_METRIC_DIGITS = (3, 3, 3, 3, 2, 2, 2, 2, 2)
+
+# Frames at least this long use the numba kernel when numba is installed
+NUMBA_MIN_ROWS = 100_000
+
+# Frames up to this long reuse per-thread work arrays between calls; longer ones allocate fresh arrays, so no
+# thread keeps more than a few tens of megabytes alive after a one-off large call
+SCRATCH_MAX_ROWS = 1_000_000
+
+# Ticks per second of the datetime units pandas and polars store timestamps in
+_TICKS_PER_SECOND = {"s": 1, "ms": 1_000, "us": 1_000_000, "ns": 1_000_000_000}
+
+# int64 view of NaT
+_NAT = np.iinfo(np.int64).min
+
+
+@lru_cache(maxsize=100)
+def _load_yaml_cached(path, mtime_ns, size):
+    """Parse a YAML file; the (mtime_ns, size) arguments key the cache so edited files are parsed again."""
+    with open(path, "r") as file:
+        return yaml.load(file, Loader=_YamlLoader)
+
+
+def _ensure_datetime(column, errors="raise"):
+    """Return column unchanged when it already has a datetime dtype, otherwise parse it with pd.to_datetime."""
+    if is_datetime64_any_dtype(column):
+        return column
+    return pd.to_datetime(column, errors=errors)
+
+
+def _categorical(column):
+    """
+    Return column as a pd.Categorical.
+
+    pandas can't build one from an Arrow dictionary column that has nulls (it reads the dictionary indices
+    zero-copy, which Arrow refuses when they are masked), so such columns are decoded to their value type first.
+    """
+    pyarrow_dtype = getattr(column.dtype, "pyarrow_dtype", None)
+    if hasattr(pyarrow_dtype, "index_type") and column.hasnans:
+        column = column.astype(pd.ArrowDtype(pyarrow_dtype.value_type))
+    return pd.Categorical(column)
+
+
+def _clamped_datetimes(column, lower=None, upper=None, unit="ns"):
+    """
+    Return the datetime64 values of a datetime column in unit (at least as fine as its own) for duration arithmetic.
+
+    Columns stored in a coarser unit are first clamped to the lower/upper pd.Timestamp bounds in their own
+    unit, so values outside the target unit's range (e.g. a 9999-12-31 sentinel) can't wrap around on
+    conversion. Callers pass bounds that only move values which would give a zero duration anyway. NaT stays NaT.
+    """
+    column_unit = column.dt.unit
+    values = column.to_numpy(dtype=f"datetime64[{column_unit}]")
+    if column_unit == unit:
+        return values
+    if lower is not None:
+        values = np.maximum(values, lower.floor(column_unit).as_unit(column_unit).to_datetime64())
+    if upper is not None:
+        values = np.minimum(values, upper.ceil(column_unit).as_unit(column_unit).to_datetime64())
+    return values.astype(f"datetime64[{unit}]")
+
+
+@lru_cache(maxsize=None)
+def _get_truncate_kernel():
+    """
+    Import numba and compile the fused truncation kernel on first use.
+
+    numba is only imported once a frame reaches NUMBA_MIN_ROWS, so importing this module stays cheap for
+    callers that never do.
+
+    Returns:
+        Callable | None: The compiled kernel, or None when numba is not installed.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def _truncate_kernel(
+        start_ticks,
+        end_ticks,
+        range_start_ticks,
+        range_end_ticks,
+        ticks_per_second,
+        codes,
+        standard_times,
+        effective_start_ticks,
+        effective_end_ticks,
+        effective_duration,
+        prorated,
+    ):
+        """Clip each event to the range and write its effective bounds, duration and prorated time in one pass."""
+        for i in prange(start_ticks.size):
+            start = start_ticks[i]
+            end = end_ticks[i] if end_ticks[i] < range_end_ticks else range_end_ticks
+            if start == _NAT:
+                duration = 0.0
+            else:
+                start = start if start > range_start_ticks else range_start_ticks
+                duration = (end - start) / ticks_per_second if end > start else 0.0
+            effective_start_ticks[i] = start
+            effective_end_ticks[i] = end
+            effective_duration[i] = duration
+            code = codes[i]
+            standard_time = standard_times[code] if code >= 0 else 0.0
+            prorated[i] = standard_time if standard_time < duration else duration
+
+    return _truncate_kernel
 
 
 class OEECalculator:
-    def __init__(self, config_file=None):
+    def __init__(self, config_file=None, result_cache_size=128):
         """
         Initialize the OEECalculator with an optional configuration file.
 
         Parameters:
             config_file (str): Path to a YAML file containing value-added times for each operation.
+            result_cache_size (int): Number of calculate_oee results kept for calls made with a cache_key
+                (0 disables the cache).
         """
         self.value_added_times = self.load_value_added_times(config_file) if config_file else {}
+        self._value_added_lookup_items = None
+        self.result_cache_size = result_cache_size
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self._scratch = threading.local()
+
+    def clear_scratch_buffers(self):
+        """Release the work arrays kept between calls (see _scratch_buffer) for every thread."""
+        self._scratch = threading.local()
+
+    def _scratch_buffer(self, name, length, dtype):
+        """
+        Return a work array of the given length and dtype, reused across calls made from the same thread.
+
+        Work arrays only hold intermediate results: DataFrame.assign copies them into the frames it builds, so
+        the next call can overwrite them. Each thread keeps one array per name for the names its code path
+        asks for, sized for its most recent frame, and drops them when it exits. Frames longer than
+        SCRATCH_MAX_ROWS always get a fresh array.
+        """
+        if length > SCRATCH_MAX_ROWS:
+            return np.empty(length, dtype=dtype)
+        buffer = getattr(self._scratch, name, None)
+        if buffer is None or len(buffer) != length or buffer.dtype != dtype:
+            buffer = np.empty(length, dtype=dtype)
+            setattr(self._scratch, name, buffer)
+        return buffer
 
     def load_value_added_times(self, config_file):
         """
         Load value-added times from a YAML configuration file.
 
+        The file is either a mapping of operations to value-added times, or a config with that mapping under a
+        value_added_times key (as in config.yaml). Times are validated and converted to float here, once, so
+        the calculation paths can use them without per-row checks.
+
         Parameters:
             config_file (str): Path to the configuration file.
 
         Returns:
-            dict: A dictionary mapping operations to value-added times.
+            dict: A dictionary mapping operations to value-added times in float seconds.
         """
         try:
-            with open(config_file, "r") as file:
-                return yaml.safe_load(file)
+            stat = os.stat(config_file)
+            config = _load_yaml_cached(os.path.abspath(config_file), stat.st_mtime_ns, stat.st_size)
         except FileNotFoundError:
             raise FileNotFoundError(f"Config file '{config_file}' not found.")
         except yaml.YAMLError as e:
             raise ValueError(f"Error parsing YAML config file: {e}")
 
-    def truncate_events(self, operations_df, start_time, end_time):
+        if isinstance(config, dict) and "value_added_times" in config:
+            config = config["value_added_times"]
+        if not isinstance(config, dict):
+            raise ValueError(f"Config file '{config_file}' must map operations to value-added times.")
+
+        # Validate once at load time; building a new dict also keeps callers away from the cached parse
+        for operation, standard_time in config.items():
+            if isinstance(standard_time, bool) or not isinstance(standard_time, (int, float)):
+                raise ValueError(
+                    f"Value-added time for '{operation}' must be numeric, got {type(standard_time).__name__}"
+                )
+        return {operation: float(standard_time) for operation, standard_time in config.items()}
+
+    def _get_value_added_lookup(self):
+        """
+        Return the value-added times as a numpy lookup table for vectorized code-based access.
+
+        The table is rebuilt only when value_added_times has changed (reassigned or edited in place) since
+        the last call, so repeated calculations reuse it.
+
+        Returns:
+            tuple: (pd.Index of operations, float64 array of standard times in seconds). The array has one
+                trailing 0.0 entry, so indexing it with the -1 code that get_indexer returns for unknown
+                operations yields 0.
+        """
+        items = tuple(self.value_added_times.items())
+        if self._value_added_lookup_items != items:
+            self._value_added_lookup = (
+                pd.Index([operation for operation, _ in items]),
+                np.array([standard_time for _, standard_time in items] + [0.0], dtype="float64"),
+            )
+            self._value_added_lookup_items = items
+        return self._value_added_lookup
+
+    def truncate_events(self, operations_df, start_time, end_time, debug=False):
         """
         Truncate operations to fit within the specified time range.
 
@@ -40,39 +250,169 @@ class OEECalculator:
             operations_df (pd.DataFrame): DataFrame of operations with timestamps.
             start_time (datetime): Start of the time range.
             end_time (datetime): End of the time range.
+            debug (bool): Write the truncated events to debug_truncated_events.csv in the working directory.
 
         Returns:
             pd.DataFrame: DataFrame with truncated event durations and value-added times.
+
+        Timestamp columns that already have a datetime dtype are not re-parsed, so callers that parse once
+        and evaluate many time ranges pay no conversion cost per call. This includes pyarrow-backed columns
+        (e.g. from pd.read_parquet(..., dtype_backend="pyarrow")), which are likewise used as-is. Arrow string
+        and dictionary operation columns give the same durations and value-added times as object columns,
+        including when they contain nulls; dictionary columns with nulls are decoded to strings first.
         """
-        # Convert timestamps to datetime objects
-        operations_df["timestamp_start"] = pd.to_datetime(operations_df["timestamp_start"])
-        operations_df["timestamp_end"] = pd.to_datetime(operations_df["timestamp_end"], errors="coerce")
+        return self._truncate_events(operations_df, pd.Timestamp(start_time), pd.Timestamp(end_time), debug=debug)
 
-        # Fill missing end timestamps with the specified end_time (live/ongoing operation)
-        operations_df["timestamp_end"] = operations_df["timestamp_end"].fillna(pd.Timestamp(end_time))
+    def _truncate_events(self, operations_df, range_start, range_end, debug=False, drop_empty=True):
+        """
+        truncate_events for range bounds that are already pd.Timestamp objects.
 
-        # Clip timestamps to the specified range
-        operations_df["effective_start"] = operations_df["timestamp_start"].clip(lower=pd.Timestamp(start_time))
-        operations_df["effective_end"] = operations_df["timestamp_end"].clip(upper=pd.Timestamp(end_time))
+        Parameters:
+            operations_df (pd.DataFrame): DataFrame of operations with timestamps.
+            range_start (pd.Timestamp): Start of the time range.
+            range_end (pd.Timestamp): End of the time range.
+            debug (bool): Write the truncated events to debug_truncated_events.csv in the working directory.
+            drop_empty (bool): Drop rows with zero effective duration. Aggregating callers pass False to skip
+                the frame copy, since those rows add zero to every sum; debug output is always filtered.
 
-        # Calculate effective duration in seconds
-        operations_df["effective_duration"] = (
-            (operations_df["effective_end"] - operations_df["effective_start"]).dt.total_seconds()
-        ).clip(lower=0)
+        Returns:
+            pd.DataFrame: DataFrame with truncated event durations and value-added times.
+        """
+        # Convert timestamps to datetime objects; columns that are already datetimes are used as-is
+        timestamp_start = _ensure_datetime(operations_df["timestamp_start"])
+        timestamp_end = _ensure_datetime(operations_df["timestamp_end"], errors="coerce")
+
+        # Event logs are usually ordered by start time: skip everything starting at or after range_end up front
+        if timestamp_start.is_monotonic_increasing:
+            stop = timestamp_start.searchsorted(range_end)
+            operations_df = operations_df.iloc[:stop]
+            timestamp_start = timestamp_start.iloc[:stop]
+            timestamp_end = timestamp_end.iloc[:stop]
+
+        # Fill missing end timestamps with range_end (live/ongoing operation)
+        end_unit = np.datetime_data(timestamp_end.dtype)[0] if isinstance(timestamp_end.dtype, np.dtype) else None
+        if end_unit is not None and range_end.tz is None and range_end.as_unit(end_unit) == range_end:
+            # Single masked write through the int64 view of our own copy instead of fillna's mask + take +
+            # reassemble. It stays in the column's unit, so far-future sentinels such as 9999-12-31 in a
+            # datetime64[us] column can't overflow, and the Series wraps the copy without copying it again.
+            end_values = timestamp_end.to_numpy(copy=True)
+            end_ticks = end_values.view("int64")
+            end_ticks[end_ticks == _NAT] = range_end.as_unit(end_unit).to_datetime64().astype("int64")
+            timestamp_end = pd.Series(end_values, index=timestamp_end.index, copy=False)
+        else:
+            timestamp_end = timestamp_end.fillna(range_end)
+
+        operations, standard_times = self._get_value_added_lookup()
+        use_kernel = (
+            len(operations_df) >= NUMBA_MIN_ROWS
+            and isinstance(timestamp_start.dtype, np.dtype)
+            and timestamp_end.dtype == timestamp_start.dtype
+            and range_start.tz is None
+            and range_end.tz is None
+            and range_start.as_unit(timestamp_start.dt.unit) == range_start
+            and range_end.as_unit(timestamp_start.dt.unit) == range_end
+            and _get_truncate_kernel() is not None
+        )
+        if use_kernel:
+            # Clip, duration and prorate fused into one parallel pass over the int64 buffers, in the columns'
+            # own unit so far-future timestamps can't overflow and the outputs keep the input's resolution.
+            # Dividing whole ticks by ticks per second rounds exactly like the pandas path below.
+            # Standard times are gathered once per distinct operation; code -1 (missing operation) reads 0.
+            unit = timestamp_start.dt.unit
+            categorical_operations = _categorical(operations_df["operation"])
+            category_times = standard_times[np.append(operations.get_indexer(categorical_operations.categories), -1)]
+            row_count = len(operations_df)
+            effective_start = self._scratch_buffer("effective_start", row_count, timestamp_start.dtype)
+            effective_end = self._scratch_buffer("effective_end", row_count, timestamp_start.dtype)
+            effective_duration = self._scratch_buffer("effective_duration", row_count, "float64")
+            prorated = self._scratch_buffer("prorated", row_count, "float64")
+            _get_truncate_kernel()(
+                timestamp_start.to_numpy().view("int64"),
+                timestamp_end.to_numpy().view("int64"),
+                range_start.as_unit(unit).to_datetime64().astype("int64"),
+                range_end.as_unit(unit).to_datetime64().astype("int64"),
+                float(_TICKS_PER_SECOND[unit]),
+                categorical_operations.codes,
+                category_times,
+                effective_start.view("int64"),
+                effective_end.view("int64"),
+                effective_duration,
+                prorated,
+            )
+        else:
+            # Clip timestamps to the specified range
+            effective_start = timestamp_start.clip(lower=range_start)
+            effective_end = timestamp_end.clip(upper=range_end)
+
+            # Calculate effective duration in seconds directly on the int64 ticks of the finer of the two
+            # columns' units, divided by its ticks per second as in the kernel, so a far-future range_end or
+            # timestamp never passes through nanoseconds. A start after range_end or an end before range_start
+            # can only give a zero duration, so clamping them to the range keeps the coarser column from
+            # overflowing when it is converted to the finer unit.
+            unit = max((effective_start.dt.unit, effective_end.dt.unit), key=_TICKS_PER_SECOND.get)
+            start_values = _clamped_datetimes(effective_start, upper=range_end, unit=unit)
+            end_values = _clamped_datetimes(effective_end, lower=range_start, unit=unit)
+            row_count = len(operations_df)
+            ticks = np.subtract(
+                end_values.view("int64"),
+                start_values.view("int64"),
+                out=self._scratch_buffer("ticks", row_count, "int64"),
+            )
+            effective_duration = np.divide(
+                ticks, _TICKS_PER_SECOND[unit], out=self._scratch_buffer("effective_duration", row_count, "float64")
+            )
+            effective_duration[np.isnat(start_values) | np.isnat(end_values)] = 0
+            np.clip(effective_duration, 0, None, out=effective_duration)
+
+        # Build the result in one assign so the caller's frame is left untouched
+        operations_df = operations_df.assign(
+            timestamp_start=timestamp_start,
+            timestamp_end=timestamp_end,
+            effective_start=effective_start,
+            effective_end=effective_end,
+            effective_duration=effective_duration,
+        )
+        if use_kernel:
+            operations_df = operations_df.assign(prorated_value_added_time=prorated)
 
         # Drop rows with zero effective duration
-        operations_df = operations_df[operations_df["effective_duration"] > 0]
-
-        # Calculate prorated value-added time
-        operations_df["prorated_value_added_time"] = operations_df.apply(
-            lambda row: self.calculate_prorated_value_added_time(
-                row["operation"], row["effective_start"], row["effective_end"]
-            ),
-            axis=1,
-        )
+        has_duration = operations_df["effective_duration"].to_numpy() > 0
+        operations_in_range = operations_df["operation"][has_duration]
+        if drop_empty or debug:
+            operations_df = operations_df[has_duration]
+
+        # Check only the distinct operations inside the range for config entries, then warn once for all unknown ones
+        missing_operations = [
+            operation for operation in operations_in_range.unique() if operation not in self.value_added_times
+        ]
+        if missing_operations:
+            warnings.warn(
+                f"Operations {sorted(missing_operations, key=str)} not found in value-added times config. "
+                "Defaulting to 0."
+            )
+
+        # Calculate prorated value-added time (vectorized equivalent of calculate_prorated_value_added_time)
+        if not use_kernel:
+            effective_duration = operations_df["effective_duration"].to_numpy(dtype="float64")
+            if operations_df["operation"].dtype != object:
+                # Look up standard times once per category, then gather them by category code. Categorical,
+                # string and Arrow dictionary columns factorize without hashing each row in Python.
+                # The appended -1 picks the table's trailing 0.0, so rows with a missing operation read 0.
+                categorical_operations = _categorical(operations_df["operation"])
+                category_times = standard_times[
+                    np.append(operations.get_indexer(categorical_operations.categories), -1)
+                ]
+                prorated = np.minimum(category_times[categorical_operations.codes], effective_duration)
+            else:
+                # One hash lookup per row into the operations index, then a gather from the standard-time table
+                prorated = np.minimum(
+                    standard_times[operations.get_indexer(operations_df["operation"])], effective_duration
+                )
+            operations_df = operations_df.assign(prorated_value_added_time=prorated)
 
         # Debug: Save intermediate results
-        operations_df.to_csv("debug_truncated_events.csv", index=False)
+        if debug:
+            operations_df.to_csv("debug_truncated_events.csv", index=False)
 
         return operations_df
 
@@ -99,55 +439,498 @@ class OEECalculator:
         # Prorated value-added time cannot exceed the effective duration
         return min(standard_time, operation_duration)
 
-    def calculate_oee(self, operations_df, start_time, end_time, overrides=None):
+    def calculate_oee(
+        self, operations_df, start_time, end_time, overrides=None, engine="pandas", debug=False, cache_key=None
+    ):
         """
         Calculate OEE metrics within a specific time range, with optional loss category overrides.
 
         Parameters:
-            operations_df (pd.DataFrame): Table of batch operations with optional loss categories.
+            operations_df (pd.DataFrame): Table of batch operations with optional loss categories. The polars
+                engine also accepts a pl.DataFrame or pl.LazyFrame.
             start_time (datetime): Start of the time range.
             end_time (datetime): End of the time range.
             overrides (dict): Optional mapping of operation IDs to overridden loss categories.
+            engine (str): "pandas" (default), "polars" to run truncation and aggregation as one lazy Polars
+                query (requires the optional polars package), or "auto" to use polars for Polars inputs
+                and pandas otherwise.
+            debug (bool): Write intermediate DataFrames to debug_*.csv files in the working directory
+                (pandas engine only).
+            cache_key (Hashable): Optional name for the contents of operations_df (e.g. a file path and its
+                mtime). Results are cached per (cache_key, time range, overrides, engine, value-added times),
+                so repeated windows over unchanged data skip the computation; pass a new key whenever the data
+                changes. Calls without a cache_key, or with debug=True, are never cached.
 
         Returns:
             dict: OEE metrics including availability, performance, quality, and overall OEE.
         """
-        # Apply truncation
-        truncated_df = self.truncate_events(operations_df, start_time, end_time)
+        # Convert the range bounds once; truncation, the polars query and the summary all reuse them
+        range_start = pd.Timestamp(start_time)
+        range_end = pd.Timestamp(end_time)
+
+        if engine == "auto":
+            engine = "polars" if type(operations_df).__module__.startswith("polars") else "pandas"
+        if engine == "polars":
+            calculate = self._calculate_oee_polars
+        elif engine == "pandas":
+            calculate = self._calculate_oee_pandas
+        else:
+            raise ValueError(f"Unknown engine '{engine}'. Expected 'pandas', 'polars' or 'auto'.")
+
+        if cache_key is None or debug or not self.result_cache_size:
+            return calculate(operations_df, range_start, range_end, overrides, debug=debug)
+
+        # Serve repeated windows from the LRU result cache; hand out copies so callers can't mutate entries.
+        # The bounds are keyed as pd.Timestamp objects, which stay distinct for naive and tz-aware bounds and
+        # work outside the nanosecond range. The lock only guards the cache, so threads still calculate
+        # concurrently; two threads missing on the same key both calculate and store the same result.
+        key = (
+            cache_key,
+            range_start,
+            range_end,
+            frozenset(overrides.items()) if overrides else None,
+            engine,
+            tuple(self.value_added_times.items()),
+        )
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+                return dict(result)
+        result = calculate(operations_df, range_start, range_end, overrides)
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+        return dict(result)
+
+    def calculate_oee_batch(self, operations_df, window_starts, window_ends, overrides=None):
+        """
+        Calculate OEE metrics for many time windows at once (e.g. rolling or per-shift OEE).
 
-        # Handle missing loss categories: default to 'unknown_loss'
-        truncated_df["loss_category"] = truncated_df.get("loss_category", "unknown_loss")
+        Timestamps, loss categories and standard times are resolved once for all windows. Each event is then
+        paired only with the windows it can overlap, located with np.searchsorted on the start-sorted
+        windows, and the per-window sums and metrics are computed as array operations instead of one
+        calculate_oee call per window.
 
-        # Apply overrides if provided
-        if overrides:
-            truncated_df["loss_category"] = truncated_df["operation"].map(overrides).fillna(truncated_df["loss_category"])
+        Parameters:
+            operations_df (pd.DataFrame): Table of batch operations with optional loss categories.
+            window_starts (array-like of datetime): Start of each time window.
+            window_ends (array-like of datetime): End of each time window, aligned with window_starts.
+            overrides (dict): Optional mapping of operation IDs to overridden loss categories.
+
+        Returns:
+            pd.DataFrame: One row per window, in input order, with window_start, window_end and the metrics
+                returned by calculate_oee. Windows without any events get 0 for availability, performance,
+                quality and oee and NaN for the remaining columns, mirroring calculate_oee's empty result.
+        """
+        window_starts = pd.DatetimeIndex(window_starts)
+        window_ends = pd.DatetimeIndex(window_ends)
+        if len(window_starts) != len(window_ends):
+            raise ValueError("window_starts and window_ends must have the same length.")
+
+        # Resolve timestamps, loss categories and standard times once, independent of the windows
+        operations_df = self._project_operations(operations_df)
+        timestamp_start = _ensure_datetime(operations_df["timestamp_start"])
+        timestamp_end = _ensure_datetime(operations_df["timestamp_end"], errors="coerce")
+        timezone_aware = {
+            timestamps.tz is not None
+            for timestamps in (timestamp_start.dt, timestamp_end.dt, window_starts, window_ends)
+        }
+        if len(timezone_aware) > 1:
+            raise TypeError(
+                "Cannot compare tz-naive and tz-aware timestamps: the event timestamps and the window starts and "
+                "ends must either all be tz-naive or all be tz-aware."
+            )
+
+        # Work in the finest unit of the events and windows. Events are first clamped to the span of all
+        # windows in their own unit, which leaves every overlap unchanged and keeps far-future timestamps
+        # (e.g. a 9999-12-31 sentinel) from overflowing that unit.
+        unit = max(
+            (timestamp_start.dt.unit, timestamp_end.dt.unit, window_starts.unit, window_ends.unit),
+            key=_TICKS_PER_SECOND.get,
+        )
+        ticks_per_second = _TICKS_PER_SECOND[unit]
+        span_start = window_starts.min() if len(window_starts) else None
+        span_end = window_ends.max() if len(window_ends) else None
+        event_start = _clamped_datetimes(timestamp_start, span_start, span_end, unit).view("int64")
+        event_end = _clamped_datetimes(timestamp_end, span_start, span_end, unit).view("int64")
+        # Missing end timestamps run to the end of every window (live/ongoing operation)
+        event_end = np.where(event_end == _NAT, np.iinfo(np.int64).max, event_end)
+        loss_categories = self._resolve_loss_categories(operations_df, overrides)
+        operation_categories = _categorical(operations_df["operation"])
+        operations, standard_times = self._get_value_added_lookup()
+        category_times = standard_times[np.append(operations.get_indexer(operation_categories.categories), -1)]
+        row_standard_times = category_times[operation_categories.codes]
+
+        # OEE component each loss category counts against (0, 1, 2 in LOSS_BUCKETS order), -1 if none
+        bucket_of_category = np.full(len(loss_categories.categories) + 1, -1, dtype=np.intp)
+        for bucket, bucket_categories in enumerate(LOSS_BUCKETS.values()):
+            bucket_of_category[:-1][loss_categories.categories.isin(bucket_categories)] = bucket
+        row_buckets = bucket_of_category[loss_categories.codes]
+
+        # Windows starting at or after an event's end can't overlap it. When the window ends are sorted too
+        # (rolling and shift windows), windows ending at or before the event's start are skipped as well.
+        order = np.argsort(window_starts.as_unit(unit).asi8, kind="stable")
+        starts = window_starts.as_unit(unit).asi8[order]
+        ends = window_ends.as_unit(unit).asi8[order]
+        upper = np.searchsorted(starts, event_end, side="left")
+        if np.all(ends[1:] >= ends[:-1]):
+            lower = np.searchsorted(ends, event_start, side="right")
+        else:
+            lower = np.zeros_like(upper)
+        counts = np.maximum(upper - lower, 0)
+        counts[event_start == _NAT] = 0
+
+        # Expand to one (event, window) pair per candidate overlap and clip each event to its window
+        rows = np.repeat(np.arange(len(counts)), counts)
+        windows = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - lower, counts)
+        overlap = (
+            np.minimum(event_end[rows], ends[windows]) - np.maximum(event_start[rows], starts[windows])
+        ) / ticks_per_second
+        np.clip(overlap, 0, None, out=overlap)
+
+        in_range = overlap > 0
+        event_in_range = np.zeros(len(counts), dtype=bool)
+        event_in_range[rows[in_range]] = True
+        missing_operations = [
+            operation
+            for operation in operations_df["operation"][event_in_range].unique()
+            if operation not in self.value_added_times
+        ]
+        if missing_operations:
+            warnings.warn(
+                f"Operations {sorted(missing_operations, key=str)} not found in value-added times config. "
+                "Defaulting to 0."
+            )
+
+        # Per-window sums as duration-weighted histograms over (bucket, window) and window
+        window_count = len(starts)
+        pair_buckets = row_buckets[rows]
+        counted = pair_buckets >= 0
+        bucket_losses = np.bincount(
+            pair_buckets[counted] * window_count + windows[counted],
+            weights=overlap[counted],
+            minlength=len(LOSS_BUCKETS) * window_count,
+        ).reshape(len(LOSS_BUCKETS), window_count)
+        availability_losses, performance_losses, quality_losses = bucket_losses
+        value_added_time = np.bincount(
+            windows, weights=np.minimum(row_standard_times[rows], overlap), minlength=window_count
+        )
+        has_events = np.bincount(windows[in_range], minlength=window_count) > 0
+
+        # Same component formulas as _summarize_oee, elementwise over the windows
+        total_time = (ends - starts) / ticks_per_second
+        with np.errstate(divide="ignore", invalid="ignore"):
+            availability = np.where(total_time > 0, np.maximum((total_time - availability_losses) / total_time, 0), 0)
+            performance = np.where(total_time > 0, np.maximum(1 - performance_losses / total_time, 0), 0)
+            quality = np.where(total_time > 0, np.maximum(1 - quality_losses / total_time, 0), 0)
+        oee = availability * performance * quality
+
+        metrics = np.vstack(
+            [
+                availability,
+                performance,
+                quality,
+                oee,
+                value_added_time,
+                availability_losses,
+                performance_losses,
+                quality_losses,
+                total_time,
+            ]
+        )
+        # Rounded like round() on the float64 values in _summarize_oee, one metric row at a time
+        metrics = np.array([np.round(row, digits) for row, digits in zip(metrics, _METRIC_DIGITS)])
+        metrics[:4, ~has_events] = 0
+        metrics[4:, ~has_events] = np.nan
+
+        # Back to the caller's window order
+        metrics[:, order] = metrics.copy()
+        return pd.DataFrame(
+            {"window_start": window_starts, "window_end": window_ends, **dict(zip(_METRIC_NAMES, metrics))}
+        )
+
+    def _calculate_oee_pandas(self, operations_df, range_start, range_end, overrides=None, debug=False):
+        """
+        pandas implementation of calculate_oee.
+
+        Parameters:
+            operations_df (pd.DataFrame): Table of batch operations with optional loss categories.
+            range_start (pd.Timestamp): Start of the time range.
+            range_end (pd.Timestamp): End of the time range.
+            overrides (dict): Optional mapping of operation IDs to overridden loss categories.
+            debug (bool): Write intermediate DataFrames to debug_*.csv files in the working directory.
+
+        Returns:
+            dict: OEE metrics including availability, performance, quality, and overall OEE.
+        """
+        operations_df = self._project_operations(operations_df)
+
+        # Apply truncation
+        truncated_df = self._truncate_events(operations_df, range_start, range_end, debug=debug, drop_empty=False)
+
+        # Handle missing loss categories (default 'unknown_loss') and apply overrides, all on category codes
+        loss_categories = self._resolve_loss_categories(truncated_df, overrides)
+        truncated_df["loss_category"] = loss_categories
 
         # Debug: Save after truncation and overrides
-        truncated_df.to_csv("debug_after_overrides.csv", index=False)
+        if debug:
+            truncated_df.to_csv("debug_after_overrides.csv", index=False)
 
         # Handle case with no valid operations
-        if truncated_df.empty:
-            print(f"No valid operations found within the time range: {start_time} to {end_time}")
+        durations = truncated_df["effective_duration"].to_numpy(dtype="float64")
+        in_range = durations > 0
+        if not in_range.any():
+            print(f"No valid operations found within the time range: {range_start} to {range_end}")
             return {"availability": 0, "performance": 0, "quality": 0, "oee": 0}
 
-        # Calculate total time in the range
-        total_time = (pd.Timestamp(end_time) - pd.Timestamp(start_time)).total_seconds()
+        # Aggregate losses per OEE component on the category codes: one sum over that component's in-range
+        # rows, in row order, as the per-component Series.sum always did, so the float64 totals (and how they
+        # round) stay the same to the last bit. Rows without a category (code -1) read the appended False.
+        durations = durations[in_range]
+        codes = loss_categories.codes[in_range]
+        bucket_losses = {
+            bucket: durations[np.append(loss_categories.categories.isin(categories), False)[codes]].sum()
+            for bucket, categories in LOSS_BUCKETS.items()
+        }
+
+        # Aggregate value-added time over the in-range rows only: the zero-duration rows kept for speed add
+        # nothing, but would regroup the pairwise float64 sum and change its last bits
+        value_added_time = truncated_df["prorated_value_added_time"].to_numpy(dtype="float64")[in_range].sum()
 
-        # Aggregate losses
-        availability_losses = truncated_df.loc[
-            truncated_df["loss_category"].isin(["unplanned_stop", "planned_stop"]), "effective_duration"
-        ].sum()
+        # Debug: Save final results
+        if debug:
+            truncated_df.to_csv("debug_final_oee.csv", index=False)
+
+        return self._summarize_oee(bucket_losses, value_added_time, range_start, range_end)
+
+    def _project_operations(self, operations_df):
+        """
+        Select the columns the OEE calculation reads and turn the string columns into categoricals.
+
+        Wide MES tables then don't drag their other columns through every copy, and low-cardinality
+        string columns are cheaper to map and aggregate as categoricals.
+
+        Parameters:
+            operations_df (pd.DataFrame): Table of batch operations with optional loss categories.
+
+        Returns:
+            pd.DataFrame: operation, timestamp_start, timestamp_end and (if present) loss_category.
+        """
+        columns = ["operation", "timestamp_start", "timestamp_end"]
+        if "loss_category" in operations_df:
+            columns.append("loss_category")
+        return operations_df[columns].assign(
+            **{
+                column: _categorical(operations_df[column])
+                for column in ("operation", "loss_category")
+                if column in columns
+            }
+        )
+
+    def _resolve_loss_categories(self, truncated_df, overrides=None):
+        """
+        Resolve each operation's loss category, applying the 'unknown_loss' default and any overrides.
+
+        Equivalent to truncated_df["operation"].map(overrides).fillna(truncated_df["loss_category"]), but the
+        overrides are looked up once per distinct operation and merged with the existing categories through
+        their integer codes, so no per-row strings are created or hashed.
+
+        Parameters:
+            truncated_df (pd.DataFrame): Output of truncate_events.
+            overrides (dict): Optional mapping of operation IDs to overridden loss categories.
+
+        Returns:
+            pd.Categorical: Loss category of every row.
+        """
+        if "loss_category" in truncated_df:
+            loss_categories = _categorical(truncated_df["loss_category"])
+        else:
+            loss_categories = pd.Categorical.from_codes(np.zeros(len(truncated_df), dtype="int8"), ["unknown_loss"])
+
+        if not overrides:
+            return loss_categories
+
+        operations = _categorical(truncated_df["operation"])
+        override_labels = operations.categories.map(overrides)
+        categories = loss_categories.categories.union(pd.Index(override_labels.dropna().unique()))
+
+        # Translate both code sets into the merged categories; the appended -1 keeps missing values missing
+        loss_codes = np.append(categories.get_indexer(loss_categories.categories), -1)[loss_categories.codes]
+        override_codes = np.append(categories.get_indexer(override_labels), -1)[operations.codes]
+
+        return pd.Categorical.from_codes(np.where(override_codes >= 0, override_codes, loss_codes), categories)
+
+    def _calculate_oee_polars(self, operations_df, range_start, range_end, overrides=None, debug=False):
+        """
+        Polars implementation of calculate_oee: truncation, overrides and aggregation run as one lazy query.
 
-        performance_losses = truncated_df.loc[
-            truncated_df["loss_category"].isin(["small_stop", "speed_loss"]), "effective_duration"
-        ].sum()
+        Parameters:
+            operations_df (pd.DataFrame | pl.DataFrame | pl.LazyFrame): Table of batch operations with optional
+                loss categories.
+            range_start (pd.Timestamp): Start of the time range.
+            range_end (pd.Timestamp): End of the time range.
+            overrides (dict): Optional mapping of operation IDs to overridden loss categories.
+            debug (bool): Accepted for parity with the pandas engine; the polars engine writes no debug files.
+
+        Returns:
+            dict: OEE metrics, identical in layout to calculate_oee.
+        """
+        try:
+            import polars as pl
+        except ImportError:
+            raise ImportError("The 'polars' engine requires polars: pip install polars")
+
+        range_start_py = range_start.to_pydatetime()
+        range_end_py = range_end.to_pydatetime()
+
+        if isinstance(operations_df, pd.DataFrame):
+            # Parse timestamps with pandas so both engines accept the same inputs, then hand them to polars in their
+            # own unit (seconds become milliseconds, polars' coarsest) and timezone, so far-future sentinels such
+            # as 9999-12-31 don't overflow nanoseconds. Standard times and loss categories are resolved with the
+            # pandas engine's lookups, which match operations of any type (integer IDs, missing values) exactly as
+            # calculate_oee's pandas engine does.
+            operations_df = self._project_operations(operations_df)
+            timestamp_start = _ensure_datetime(operations_df["timestamp_start"])
+            timestamp_end = _ensure_datetime(operations_df["timestamp_end"], errors="coerce")
+            operations = _categorical(operations_df["operation"])
+            known_operations, standard_times = self._get_value_added_lookup()
+            indexer = known_operations.get_indexer(operations.categories)
+            # NaN marks operations missing from the config; the appended NaN covers rows without an operation
+            category_times = np.append(np.where(indexer >= 0, standard_times[indexer], np.nan), np.nan)
+
+            frame = pl.DataFrame(
+                {
+                    "operation": pl.from_pandas(operations_df["operation"].astype("string")),
+                    "timestamp_start": pl.from_pandas(timestamp_start),
+                    "timestamp_end": pl.from_pandas(timestamp_end),
+                    "standard_time": pl.Series(category_times[operations.codes], nan_to_null=True),
+                    "loss_category": pl.from_pandas(
+                        pd.Series(self._resolve_loss_categories(operations_df, overrides)).astype("string")
+                    ),
+                }
+            ).lazy()
+        else:
+            # Polars DataFrame/LazyFrame input (e.g. from pl.scan_parquet) never leaves polars
+            frame = operations_df.lazy()
+            schema = frame.collect_schema()
+            timestamp_start = pl.col("timestamp_start")
+            if schema["timestamp_start"] == pl.String:
+                timestamp_start = timestamp_start.str.to_datetime()
+            timestamp_end = pl.col("timestamp_end")
+            if schema["timestamp_end"] == pl.String:
+                timestamp_end = timestamp_end.str.to_datetime(strict=False)
+            loss_category = pl.col("loss_category") if "loss_category" in schema else pl.lit("unknown_loss")
+            if overrides:
+                loss_category = (
+                    pl.col("operation")
+                    .cast(pl.String)
+                    .replace_strict(overrides, default=None, return_dtype=pl.String)
+                    .fill_null(loss_category)
+                )
+            frame = frame.select(
+                pl.col("operation").cast(pl.String),
+                timestamp_start,
+                timestamp_end,
+                pl.col("operation")
+                .cast(pl.String)
+                .replace_strict(
+                    list(self.value_added_times),
+                    [float(value) for value in self.value_added_times.values()],
+                    default=None,
+                    return_dtype=pl.Float64,
+                )
+                .alias("standard_time"),
+                loss_category.cast(pl.String).alias("loss_category"),
+            )
+
+        # Durations are taken on the ticks of the finer of the two timestamp units and divided by its ticks per
+        # second, as on the pandas engine, so a far-future range_end never passes through nanoseconds
+        schema = frame.collect_schema()
+        unit = max(
+            (schema[column].time_unit for column in ("timestamp_start", "timestamp_end")),
+            key=_TICKS_PER_SECOND.get,
+        )
 
-        quality_losses = truncated_df.loc[
-            truncated_df["loss_category"].isin(["rework/scrap", "startup_loss"]), "effective_duration"
-        ].sum()
+        valid = (
+            frame.with_columns(
+                # Clamping both bounds to the range leaves every duration unchanged (anything outside it has
+                # zero overlap) and keeps the difference below from overflowing
+                pl.col("timestamp_start")
+                .clip(range_start_py, range_end_py)
+                .dt.cast_time_unit(unit)
+                .alias("effective_start"),
+                pl.col("timestamp_end")
+                .fill_null(range_end_py)
+                .clip(range_start_py, range_end_py)
+                .dt.cast_time_unit(unit)
+                .alias("effective_end"),
+            )
+            .with_columns(
+                ((pl.col("effective_end") - pl.col("effective_start")).cast(pl.Int64) / _TICKS_PER_SECOND[unit])
+                .clip(lower_bound=0)
+                .alias("effective_duration")
+            )
+            .filter(pl.col("effective_duration") > 0)
+            .with_columns(
+                pl.min_horizontal(pl.col("standard_time").fill_null(0), pl.col("effective_duration")).alias(
+                    "prorated_value_added_time"
+                )
+            )
+        )
+
+        loss_totals, missing_operations = pl.collect_all(
+            [
+                valid.group_by("loss_category").agg(
+                    pl.col("effective_duration").sum(), pl.col("prorated_value_added_time").sum()
+                ),
+                valid.filter(pl.col("standard_time").is_null()).select(pl.col("operation").unique()),
+            ]
+        )
+
+        if missing_operations.height:
+            warnings.warn(
+                f"Operations {sorted(missing_operations['operation'].to_list(), key=str)} not found in "
+                "value-added times config. Defaulting to 0."
+            )
+
+        # Handle case with no valid operations
+        if loss_totals.height == 0:
+            print(f"No valid operations found within the time range: {range_start} to {range_end}")
+            return {"availability": 0, "performance": 0, "quality": 0, "oee": 0}
 
-        # Aggregate value-added time
-        value_added_time = truncated_df["prorated_value_added_time"].sum()
+        loss_sums = dict(zip(loss_totals["loss_category"].to_list(), loss_totals["effective_duration"].to_list()))
+        bucket_losses = {
+            bucket: sum(loss_sums.get(category, 0.0) for category in categories)
+            for bucket, categories in LOSS_BUCKETS.items()
+        }
+        value_added_time = loss_totals["prorated_value_added_time"].sum()
+
+        return self._summarize_oee(bucket_losses, value_added_time, range_start, range_end)
+
+    def _summarize_oee(self, bucket_losses, value_added_time, range_start, range_end):
+        """
+        Turn the losses of each OEE component into the OEE metrics dictionary.
+
+        Parameters:
+            bucket_losses (Mapping): Effective duration in seconds lost to each LOSS_BUCKETS component.
+            value_added_time (float): Total prorated value-added time in seconds.
+            range_start (pd.Timestamp): Start of the time range.
+            range_end (pd.Timestamp): End of the time range.
+
+        Returns:
+            dict: OEE metrics including availability, performance, quality, and overall OEE.
+        """
+        # Calculate total time in the range
+        total_time = (range_end - range_start).total_seconds()
+
+        # Aggregate losses. The sums are numpy float64 scalars, as the per-Series sums always were, so round()
+        # below rounds them the same way on both engines (polars hands over Python floats).
+        availability_losses = np.float64(bucket_losses["availability"])
+        performance_losses = np.float64(bucket_losses["performance"])
+        quality_losses = np.float64(bucket_losses["quality"])
+        value_added_time = np.float64(value_added_time)
 
         # Calculate components
         availability = max((total_time - availability_losses) / total_time, 0) if total_time > 0 else 0
@@ -157,9 +940,6 @@ class OEECalculator:
         # Calculate OEE
         oee = availability * performance * quality
 
-        # Debug: Save final results
-        truncated_df.to_csv("debug_final_oee.csv", index=False)
-
         return {
             "availability": round(availability, 3),
             "performance": round(performance, 3),
@@ -170,4 +950,4 @@ class OEECalculator:
             "performance_losses": round(performance_losses, 2),
             "quality_losses": round(quality_losses, 2),
             "total_time": round(total_time, 2),
-        }
\ No newline at end of file
+        }
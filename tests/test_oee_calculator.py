@@ -0,0 +1,527 @@
+import os
+import threading
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import oee_calculator
+from oee_calculator import OEECalculator
+
+RANGE_START = datetime(2024, 12, 15, 8)
+RANGE_END = datetime(2024, 12, 15, 10)
+VALUE_ADDED_TIMES = {"Mixing": 900.0, "Heating": 1800.5, "Cooling": 1200.0}
+
+
+def make_operations(rows, seed=0):
+    """Random event log around RANGE_START/RANGE_END with nanosecond timestamps and some open events."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-12-15 06:00") + pd.to_timedelta(rng.integers(0, 6 * 3600 * 10**9, rows), unit="ns")
+    end = pd.Series(start + pd.to_timedelta(rng.integers(0, 3600 * 10**9, rows), unit="ns"))
+    end[rng.random(rows) < 0.1] = pd.NaT
+    return pd.DataFrame(
+        {
+            "operation": rng.choice(["Mixing", "Heating", "Cooling", "Idle"], rows),
+            "timestamp_start": pd.Series(start),
+            "timestamp_end": end,
+            "loss_category": rng.choice(["unplanned_stop", "speed_loss", "rework/scrap", "value_added"], rows),
+        }
+    )
+
+
+@pytest.fixture
+def calculator():
+    calculator = OEECalculator()
+    calculator.value_added_times = dict(VALUE_ADDED_TIMES)
+    return calculator
+
+
+@pytest.mark.filterwarnings("ignore:Operations")
+def test_kernel_matches_pandas_path(calculator, monkeypatch):
+    if oee_calculator._get_truncate_kernel() is None:
+        pytest.skip("numba is not installed")
+    operations_df = make_operations(5_000)
+
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", 10**9)
+    expected = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", 1)
+    result = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+
+    # Bit-identical, not just close: results must not depend on which side of NUMBA_MIN_ROWS a frame falls
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+def far_future_operations():
+    """A still-open event recorded with the 9999-12-31 sentinel end, which parses to datetime64[us]."""
+    return pd.DataFrame(
+        {
+            "operation": ["Mixing", "Heating"],
+            "timestamp_start": ["2024-12-15 09:10:00", "2024-12-15 07:00:00"],
+            "timestamp_end": ["9999-12-31 00:00:00", None],
+            "loss_category": ["speed_loss", "planned_stop"],
+        }
+    )
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+def test_far_future_end_does_not_overflow(calculator, monkeypatch, numba_min_rows):
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = far_future_operations()
+
+    truncated = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+    assert truncated["timestamp_end"].tolist() == [pd.Timestamp("9999-12-31"), pd.Timestamp(RANGE_END)]
+    assert truncated["effective_duration"].tolist() == [3000.0, 7200.0]
+
+    result = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+    assert result["performance_losses"] == 3000.0
+    assert result["availability_losses"] == 7200.0
+    assert result["value_added_time"] == 900.0 + 1800.5
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+def test_far_future_start_has_zero_duration(calculator, monkeypatch, numba_min_rows):
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = pd.DataFrame(
+        {
+            "operation": ["Mixing", "Heating"],
+            "timestamp_start": ["9999-01-01 00:00:00", "2024-12-15 09:00:00"],
+            "timestamp_end": ["2024-12-15 09:00:00", "2024-12-15 09:30:00"],
+            "loss_category": ["unplanned_stop", "speed_loss"],
+        }
+    )
+
+    result = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+    assert result["availability_losses"] == 0.0
+    assert result["performance_losses"] == 1800.0
+
+
+def test_scratch_buffers_are_per_thread(calculator):
+    buffers = {}
+
+    def allocate(key):
+        buffers[key] = calculator._scratch_buffer("effective_duration", 10, "float64")
+
+    worker = threading.Thread(target=allocate, args=("worker",))
+    worker.start()
+    worker.join()
+    allocate("main")
+
+    assert buffers["main"] is not buffers["worker"]
+    assert calculator._scratch_buffer("effective_duration", 10, "float64") is buffers["main"]
+    large = oee_calculator.SCRATCH_MAX_ROWS + 1
+    assert calculator._scratch_buffer("effective_duration", large, "float64") is not calculator._scratch_buffer(
+        "effective_duration", large, "float64"
+    )
+    assert not hasattr(calculator._scratch, "nanoseconds")
+    calculator.clear_scratch_buffers()
+    assert calculator._scratch_buffer("effective_duration", 10, "float64") is not buffers["main"]
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+def test_far_future_end_time(calculator, monkeypatch, numba_min_rows):
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = pd.DataFrame(
+        {
+            "operation": ["Mixing", "Heating"],
+            "timestamp_start": ["2024-12-15 09:00:00", "2024-12-15 07:00:00"],
+            "timestamp_end": ["3000-01-01 00:00:00", None],
+            "loss_category": ["speed_loss", "unplanned_stop"],
+        }
+    )
+    range_start, range_end = pd.Timestamp("2024-12-15 08:00"), pd.Timestamp("9999-12-31")
+    mixing = (pd.Timestamp("3000-01-01") - pd.Timestamp("2024-12-15 09:00")).total_seconds()
+    heating = (range_end - range_start).total_seconds()
+
+    truncated = calculator.truncate_events(operations_df, range_start, range_end)
+    assert truncated["effective_duration"].tolist() == [mixing, heating]
+    assert truncated["timestamp_end"].tolist() == [pd.Timestamp("3000-01-01"), range_end]
+
+    result = calculator.calculate_oee(operations_df, range_start, range_end)
+    assert result["performance_losses"] == mixing
+    assert result["availability_losses"] == heating
+
+    pytest.importorskip("polars")
+    assert calculator.calculate_oee(operations_df, range_start, range_end, engine="polars") == result
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+@pytest.mark.parametrize("unit", ["s", "ms", "us", "ns"])
+def test_truncate_events_keeps_input_unit(calculator, monkeypatch, numba_min_rows, unit):
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = make_operations(50).astype(
+        {"timestamp_start": f"datetime64[{unit}]", "timestamp_end": f"datetime64[{unit}]"}
+    )
+
+    truncated = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+    for column in ["timestamp_start", "timestamp_end", "effective_start", "effective_end"]:
+        assert truncated[column].dtype == f"datetime64[{unit}]"
+
+
+def arrow_dictionary(values):
+    pa = pytest.importorskip("pyarrow")
+    values = values.astype(object).where(values.notna(), None).tolist()
+    return pd.Series(pd.array(values, dtype=pd.ArrowDtype(pa.dictionary(pa.int32(), pa.string()))))
+
+
+def test_arrow_dictionary_columns_with_nulls(calculator):
+    operations_df = make_operations(200, seed=1)
+    operations_df["operation"] = operations_df["operation"].where(operations_df.index % 7 != 0)
+    operations_df["loss_category"] = operations_df["loss_category"].where(operations_df.index % 5 != 0)
+    dictionary_df = operations_df.assign(
+        operation=arrow_dictionary(operations_df["operation"]),
+        loss_category=arrow_dictionary(operations_df["loss_category"]),
+    )
+
+    overrides = {"Idle": "planned_stop"}
+    with pytest.warns(UserWarning):
+        expected = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END, overrides=overrides)
+    with pytest.warns(UserWarning):
+        result = calculator.calculate_oee(dictionary_df, RANGE_START, RANGE_END, overrides=overrides)
+    assert result == expected
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+def test_truncate_events_arrow_dictionary_operations_with_nulls(calculator, monkeypatch, numba_min_rows):
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = make_operations(200, seed=2)
+    operations_df["operation"] = operations_df["operation"].where(operations_df.index % 7 != 0)
+    dictionary_df = operations_df.assign(operation=arrow_dictionary(operations_df["operation"]))
+
+    expected = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+    result = calculator.truncate_events(dictionary_df, RANGE_START, RANGE_END)
+    # The operation column itself keeps its Arrow dtype; everything derived from it must match
+    pd.testing.assert_frame_equal(
+        result.drop(columns="operation"), expected.drop(columns="operation"), check_exact=True
+    )
+
+
+@pytest.mark.parametrize("numba_min_rows", [10**9, 1])
+def test_arrow_backed_frame_matches_numpy_backed(calculator, monkeypatch, numba_min_rows):
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(oee_calculator, "NUMBA_MIN_ROWS", numba_min_rows)
+    operations_df = make_operations(200, seed=3)
+    operations_df["operation"] = operations_df["operation"].where(operations_df.index % 7 != 0)
+    operations_df["loss_category"] = operations_df["loss_category"].where(operations_df.index % 5 != 0)
+    arrow_df = operations_df.assign(
+        operation=arrow_dictionary(operations_df["operation"]),
+        loss_category=operations_df["loss_category"].astype(pd.ArrowDtype(pa.string())),
+        # astype to an Arrow timestamp overwrites NaT in the source buffer, so convert copies
+        timestamp_start=operations_df["timestamp_start"].copy().astype(pd.ArrowDtype(pa.timestamp("ns"))),
+        timestamp_end=operations_df["timestamp_end"].copy().astype(pd.ArrowDtype(pa.timestamp("ns"))),
+    )
+
+    with pytest.warns(UserWarning):
+        expected = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+    with pytest.warns(UserWarning):
+        result = calculator.calculate_oee(arrow_df, RANGE_START, RANGE_END)
+    assert result == expected
+
+
+def assert_engines_agree(calculator, operations_df, range_start=RANGE_START, range_end=RANGE_END, **kwargs):
+    pytest.importorskip("polars")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        expected = calculator.calculate_oee(operations_df, range_start, range_end, **kwargs)
+        result = calculator.calculate_oee(operations_df, range_start, range_end, engine="polars", **kwargs)
+    assert result == expected
+
+
+def test_polars_engine_pandas_input_with_missing_values(calculator):
+    operations_df = make_operations(200, seed=4)
+    operations_df["operation"] = operations_df["operation"].where(operations_df.index % 7 != 0)
+    operations_df["loss_category"] = operations_df["loss_category"].where(operations_df.index % 5 != 0)
+
+    assert_engines_agree(calculator, operations_df)
+    assert_engines_agree(calculator, operations_df, overrides={"Idle": "planned_stop"})
+
+
+def test_polars_engine_pandas_input_with_integer_operations(calculator):
+    calculator.value_added_times = {1: 900.0, 2: 1800.5}
+    operations_df = make_operations(200, seed=5)
+    operations_df["operation"] = operations_df.index % 4
+
+    assert_engines_agree(calculator, operations_df)
+    assert_engines_agree(calculator, operations_df, overrides={3: "planned_stop"})
+
+
+def test_polars_engine_pandas_input_with_far_future_timestamps(calculator):
+    assert_engines_agree(calculator, far_future_operations())
+
+
+def test_polars_engine_pandas_input_with_second_resolution(calculator):
+    operations_df = make_operations(200, seed=10).astype(
+        {"timestamp_start": "datetime64[s]", "timestamp_end": "datetime64[s]"}
+    )
+    assert_engines_agree(calculator, operations_df)
+    # Empty string columns parse to datetime64[s]
+    assert_engines_agree(calculator, far_future_operations().iloc[:0])
+
+
+def test_polars_engine_pandas_input_with_tz_aware_timestamps(calculator):
+    operations_df = make_operations(200, seed=11)
+    for column in ("timestamp_start", "timestamp_end"):
+        operations_df[column] = operations_df[column].dt.tz_localize("Europe/Berlin")
+    assert_engines_agree(
+        calculator,
+        operations_df,
+        pd.Timestamp(RANGE_START, tz="Europe/Berlin"),
+        pd.Timestamp(RANGE_END, tz="Europe/Berlin"),
+        overrides={"Idle": "planned_stop"},
+    )
+
+
+def batch_windows():
+    """Overlapping rolling windows, a long window, a zero-length one and one without events, out of order."""
+    starts = list(pd.date_range("2024-12-15 05:00", periods=12, freq="30min"))
+    windows = [(start, start + pd.Timedelta(hours=1)) for start in starts]
+    windows += [
+        (pd.Timestamp("2024-12-15 06:00"), pd.Timestamp("2024-12-15 12:00")),
+        (pd.Timestamp("2024-12-15 08:00"), pd.Timestamp("2024-12-15 08:00")),
+        (pd.Timestamp("2024-12-16 08:00"), pd.Timestamp("2024-12-16 09:00")),
+    ]
+    return windows[::-1][:5] + windows[5:]
+
+
+def assert_batch_matches_loop(calculator, operations_df, windows, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        result = calculator.calculate_oee_batch(
+            operations_df, [start for start, _ in windows], [end for _, end in windows], **kwargs
+        )
+        for i, (window_start, window_end) in enumerate(windows):
+            expected = calculator.calculate_oee(operations_df, window_start, window_end, **kwargs)
+            assert {metric: result[metric].iloc[i] for metric in expected} == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("overrides", [None, {"Idle": "unplanned_stop", "Mixing": "small_stop"}])
+def test_batch_matches_per_window_calculate_oee(calculator, overrides):
+    assert_batch_matches_loop(calculator, make_operations(500, seed=7), batch_windows(), overrides=overrides)
+
+
+def test_batch_without_events(calculator):
+    assert_batch_matches_loop(calculator, make_operations(10).iloc[:0], batch_windows())
+
+
+def test_batch_far_future_timestamps(calculator):
+    far_future = far_future_operations().astype(
+        {"timestamp_start": "datetime64[us]", "timestamp_end": "datetime64[us]"}
+    )
+    operations = make_operations(50, seed=8).astype(
+        {"timestamp_start": "datetime64[us]", "timestamp_end": "datetime64[us]"}
+    )
+    operations_df = pd.concat([far_future, operations], ignore_index=True)
+    assert_batch_matches_loop(calculator, operations_df, batch_windows())
+
+
+@pytest.mark.parametrize("aware", ["starts", "ends", "both"])
+def test_batch_rejects_tz_aware_windows_over_tz_naive_events(calculator, aware):
+    window_starts = pd.DatetimeIndex([RANGE_START])
+    window_ends = pd.DatetimeIndex([RANGE_END])
+    if aware in ("starts", "both"):
+        window_starts = window_starts.tz_localize("UTC")
+    if aware in ("ends", "both"):
+        window_ends = window_ends.tz_localize("UTC")
+    with pytest.raises(TypeError):
+        calculator.calculate_oee_batch(make_operations(10), window_starts, window_ends)
+
+
+@pytest.fixture
+def counted_calls(calculator, monkeypatch):
+    """Count the pandas-engine calculations calculate_oee actually runs."""
+    calls = []
+    calculate = calculator._calculate_oee_pandas
+
+    def counting(*args, **kwargs):
+        calls.append(args[1:3])
+        return calculate(*args, **kwargs)
+
+    monkeypatch.setattr(calculator, "_calculate_oee_pandas", counting)
+    return calls
+
+
+@pytest.fixture
+def small_operations():
+    operations_df = make_operations(100, seed=12)
+    return operations_df.assign(operation=operations_df["operation"].replace("Idle", "Mixing"))
+
+
+def test_result_cache_hits_and_copies(calculator, counted_calls, small_operations):
+    first = calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log")
+    first["oee"] = -1
+    second = calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log")
+
+    assert len(counted_calls) == 1
+    assert second["oee"] != -1
+    assert second == calculator.calculate_oee(small_operations, RANGE_START, RANGE_END)
+
+
+def test_result_cache_evicts_least_recently_used(calculator, counted_calls, small_operations):
+    calculator.result_cache_size = 2
+    windows = [
+        (RANGE_START, RANGE_END),
+        (RANGE_START, RANGE_START + pd.Timedelta(hours=1)),
+        (RANGE_START, RANGE_START),
+    ]
+    for window in windows[:2] + windows[:1] + windows[2:]:
+        calculator.calculate_oee(small_operations, *window, cache_key="log")
+    assert len(counted_calls) == 3
+
+    # The first window was used last before the third came in, so the second one was evicted
+    calculator.calculate_oee(small_operations, *windows[0], cache_key="log")
+    assert len(counted_calls) == 3
+    calculator.calculate_oee(small_operations, *windows[1], cache_key="log")
+    assert len(counted_calls) == 4
+
+
+def test_result_cache_invalidated_by_value_added_times(calculator, counted_calls, small_operations):
+    before = calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log")
+    calculator.value_added_times["Mixing"] = 0.0
+    after = calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log")
+
+    assert len(counted_calls) == 2
+    assert after["value_added_time"] < before["value_added_time"]
+
+
+def test_result_cache_bypassed_for_debug(calculator, counted_calls, small_operations, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for _ in range(2):
+        calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log", debug=True)
+    assert len(counted_calls) == 2
+    assert not calculator._result_cache
+
+
+def test_result_cache_far_future_and_tz_aware_bounds(calculator, small_operations):
+    # A 9999-12-31 bound needs timestamps coarser than nanoseconds
+    operations_df = small_operations.astype({"timestamp_start": "datetime64[us]", "timestamp_end": "datetime64[us]"})
+    far_future = calculator.calculate_oee(operations_df, RANGE_START, "9999-12-31", cache_key="log")
+    assert far_future == calculator.calculate_oee(operations_df, RANGE_START, "9999-12-31")
+
+    calculator.calculate_oee(small_operations, RANGE_START, RANGE_END, cache_key="log")
+    with pytest.raises(TypeError):
+        calculator.calculate_oee(
+            small_operations,
+            pd.Timestamp(RANGE_START, tz="UTC"),
+            pd.Timestamp(RANGE_END, tz="UTC"),
+            cache_key="log",
+        )
+
+
+def test_result_cache_is_thread_safe(calculator, small_operations):
+    calculator.result_cache_size = 2
+    errors = []
+
+    def evaluate(offset):
+        try:
+            for minutes in range(40):
+                window_start = RANGE_START + pd.Timedelta(minutes=(minutes + offset) % 5)
+                calculator.calculate_oee(small_operations, window_start, RANGE_END, cache_key="log")
+        except Exception as error:
+            errors.append(error)
+
+    workers = [threading.Thread(target=evaluate, args=(offset,)) for offset in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert not errors
+
+
+def test_metrics_round_float64_sums_on_both_engines(calculator):
+    # 3275.535 is stored just below the midpoint: round() gives 3275.53 for a Python float but 3275.54 for a
+    # numpy float64, which is what the per-Series sums always returned. Every path must agree on the latter.
+    operations_df = pd.DataFrame(
+        {
+            "operation": ["Mixing"],
+            "timestamp_start": [pd.Timestamp(RANGE_START)],
+            "timestamp_end": [pd.Timestamp(RANGE_START) + pd.Timedelta(seconds=3275.535)],
+            "loss_category": ["speed_loss"],
+        }
+    )
+    result = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+    assert result["performance_losses"] == round(np.float64(3275.535), 2)
+    assert_engines_agree(calculator, operations_df)
+
+    batch = calculator.calculate_oee_batch(operations_df, [RANGE_START], [RANGE_END])
+    assert batch.drop(columns=["window_start", "window_end"]).iloc[0].to_dict() == result
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_losses_match_per_component_series_sums(calculator, seed):
+    # Millisecond timestamps give 3-decimal sums, so any change in summation order shows up in the rounding
+    operations_df = make_operations(2000, seed=seed)
+    for column in ("timestamp_start", "timestamp_end"):
+        operations_df[column] = operations_df[column].dt.floor("ms")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        truncated = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+        result = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+
+    for bucket, categories in oee_calculator.LOSS_BUCKETS.items():
+        losses = truncated.loc[truncated["loss_category"].isin(categories), "effective_duration"].sum()
+        assert result[f"{bucket}_losses"] == round(losses, 2)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_value_added_time_matches_sum_over_truncated_events(calculator, seed):
+    operations_df = make_operations(2000, seed=seed)
+    for column in ("timestamp_start", "timestamp_end"):
+        operations_df[column] = operations_df[column].dt.floor("ms")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        truncated = calculator.truncate_events(operations_df, RANGE_START, RANGE_END)
+        result = calculator.calculate_oee(operations_df, RANGE_START, RANGE_END)
+
+    assert result["value_added_time"] == round(truncated["prorated_value_added_time"].sum(), 2)
+
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+def test_load_bundled_config():
+    calculator = OEECalculator(CONFIG_FILE)
+    assert calculator.value_added_times == {"heating": 30.0, "cooling": 20.0, "mixing": 15.0}
+    assert all(type(standard_time) is float for standard_time in calculator.value_added_times.values())
+
+
+def test_load_plain_mapping(tmp_path):
+    config_file = tmp_path / "times.yaml"
+    config_file.write_text("Mixing: 900\nHeating: 1800.5\n")
+    assert OEECalculator(str(config_file)).value_added_times == {"Mixing": 900.0, "Heating": 1800.5}
+
+
+@pytest.mark.parametrize("value", ["true", "'900'", "[900]"])
+def test_load_rejects_non_numeric_times(tmp_path, value):
+    config_file = tmp_path / "times.yaml"
+    config_file.write_text(f"value_added_times:\n  Mixing: {value}\n")
+    with pytest.raises(ValueError, match="Mixing"):
+        OEECalculator(str(config_file))
+
+
+def test_load_rejects_unsafe_tags(tmp_path):
+    config_file = tmp_path / "times.yaml"
+    config_file.write_text("Mixing: !!python/object/apply:os.getcwd []\n")
+    with pytest.raises(ValueError):
+        OEECalculator(str(config_file))
+
+
+def test_load_reparses_edited_file(tmp_path):
+    config_file = tmp_path / "times.yaml"
+    config_file.write_text("Mixing: 900\n")
+    assert OEECalculator(str(config_file)).value_added_times == {"Mixing": 900.0}
+
+    config_file.write_text("Mixing: 1200\nHeating: 60\n")
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert OEECalculator(str(config_file)).value_added_times == {"Mixing": 1200.0, "Heating": 60.0}
+
+
+def test_loaded_times_are_not_shared_between_instances():
+    first = OEECalculator(CONFIG_FILE)
+    second = OEECalculator(CONFIG_FILE)
+    first.value_added_times["mixing"] = 0.0
+    first.value_added_times["extra"] = 1.0
+
+    assert second.value_added_times == {"heating": 30.0, "cooling": 20.0, "mixing": 15.0}
+    assert OEECalculator(CONFIG_FILE).value_added_times == second.value_added_times